@@ -7,78 +7,165 @@
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
 from decouple import config
-import psycopg2
+import psycopg
+from psycopg.conninfo import make_conninfo
+from psycopg_pool import AsyncConnectionPool
+from scrapy.utils.defer import deferred_from_coro
+
+COLUMNS = (
+    'id',
+    'name',
+    'labelsAll',
+    'exclusively_at_rk',
+    'category',
+    'has_floor_plan',
+    'locality',
+    'new',
+    'type',
+    'price',
+    'seo_category_main_cb',
+    'seo_category_sub_cb',
+    'seo_category_type_cb',
+    'seo_locality',
+    'price_czk_value_raw',
+    'price_czk_unit',
+    'links_iterator_href',
+    'links_self_href',
+    'links_images',
+    'gps_lat',
+    'gps_lon',
+    'price_czk_alt_value_raw',
+    'price_czk_alt_unit',
+    'embedded_company_url',
+    'embedded_company_id',
+    'embedded_company_name',
+    'embedded_company_logo_small',
+)
+
+BATCH_SIZE = 500
+
+COPY_SQL = f"COPY sreality_stage ({', '.join(COLUMNS)}) FROM STDIN"
+
+# Items already stored in the database are skipped by the primary key
+PROMOTE_SQL = f"""
+    INSERT INTO sreality ({', '.join(COLUMNS)})
+    SELECT {', '.join(COLUMNS)} FROM sreality_stage
+    ON CONFLICT (id) DO NOTHING
+"""
 
 class SrealityPipeline:
 
+    def __init__(self):
+        self._buf = []
+
     def open_spider(self, spider):
+        return deferred_from_coro(self._open(spider))
+
+    async def _open(self, spider):
         hostname = 'localhost'
         username = config('POSTGRES_USER')
         password = config('POSTGRES_PASSWORD')
         database = config('POSTGRES_DB')
 
-        self.connection = psycopg2.connect(host=hostname, user=username, password=password, dbname=database)
-        self.cursor = self.connection.cursor()
-
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS sreality(
-                id bigint PRIMARY KEY, 
-                name text,
-                labelsAll text,
-                exclusively_at_rk boolean,
-                category text,
-                has_floor_plan boolean,
-                locality text,
-                new boolean,
-                type text,
-                price text,
-                seo_category_main_cb text,
-                seo_category_sub_cb text,
-                seo_category_type_cb text,
-                seo_locality text,
-                price_czk_value_raw text,
-                price_czk_unit text,
-                links_iterator_href text,
-                links_self_href text,
-                links_images text,
-                gps_lat text,
-                gps_lon text,
-                price_czk_alt_value_raw text,
-                price_czk_alt_unit text,
-                embedded_company_url text,
-                embedded_company_id text,
-                embedded_company_name text,
-                embedded_company_logo_small text
-            )
-        """)
+        conninfo = make_conninfo(host=hostname, user=username, password=password, dbname=database)
+
+        async with await psycopg.AsyncConnection.connect(conninfo) as connection:
+            await connection.execute("""
+                CREATE TABLE IF NOT EXISTS sreality(
+                    id bigint PRIMARY KEY, 
+                    name text,
+                    labelsAll text,
+                    exclusively_at_rk boolean,
+                    category text,
+                    has_floor_plan boolean,
+                    locality text,
+                    new boolean,
+                    type text,
+                    price text,
+                    seo_category_main_cb text,
+                    seo_category_sub_cb text,
+                    seo_category_type_cb text,
+                    seo_locality text,
+                    price_czk_value_raw text,
+                    price_czk_unit text,
+                    links_iterator_href text,
+                    links_self_href text,
+                    links_images text,
+                    gps_lat text,
+                    gps_lon text,
+                    price_czk_alt_value_raw text,
+                    price_czk_alt_unit text,
+                    embedded_company_url text,
+                    embedded_company_id text,
+                    embedded_company_name text,
+                    embedded_company_logo_small text
+                )
+            """)
+
+            # Batches are copied into an unlogged staging table during the
+            # crawl and moved into sreality in one go when it finishes
+            await connection.execute("""
+                CREATE UNLOGGED TABLE IF NOT EXISTS sreality_stage (LIKE sreality INCLUDING DEFAULTS)
+            """)
+
+        self.pool = AsyncConnectionPool(conninfo, min_size=4, max_size=16, open=False)
+        await self.pool.open()
 
     def close_spider(self, spider):
-        self.cursor.close()
-        self.connection.close()
+        return deferred_from_coro(self._close(spider))
 
-    def process_item(self, item, spider):
+    async def _close(self, spider):
+        rows, self._buf = self._buf, []
+        await self.flush(rows, spider)
+        await self.promote(spider)
+        await self.pool.close()
+
+    async def process_item(self, item, spider):
         adapter = ItemAdapter(item)
 
-        # Check if id already exists in the database
-        self.cursor.execute("SELECT 1 FROM sreality WHERE id = %s", (adapter.get('id'),))
-        if self.cursor.fetchone():
-            spider.logger.info(f"Item with id {adapter.get('id')} already exists in the database")
-            return item  # Skip this item
-    
-        columns = ', '.join(adapter.keys())
-        values = ', '.join(['%s'] * len(adapter))
-        sql = f"INSERT INTO sreality ({columns}) VALUES ({values})"
-        
-        # Convert all values to string
-        values = [str(value) for value in adapter.values()]
-        
-        try:
-            self.cursor.execute(sql, values)
-            self.connection.commit()
-        except psycopg2.ProgrammingError as e:
-            self.connection.rollback()
-            spider.logger.error(f"Error processing item: {e}")
-            with open('exceptions.log', 'a') as f:
-                f.write(f"{e}\n")
-        
+        # Scalars are passed as they are and adapted by psycopg, None becomes
+        # NULL. Nested values have no column type of their own and are kept
+        # as text
+        self._buf.append(tuple(
+            str(value) if isinstance(value, (list, dict)) else value
+            for value in map(adapter.get, COLUMNS)
+        ))
+        if len(self._buf) >= BATCH_SIZE:
+            # Items keep filling a fresh buffer while this batch is written
+            rows, self._buf = self._buf, []
+            await self.flush(rows, spider)
+
         return item
+
+    async def flush(self, rows, spider):
+        if not rows:
+            return
+
+        # The pooled connection runs the batch as one transaction, committed
+        # when the block exits and rolled back if any statement fails
+        try:
+            async with self.pool.connection() as connection, connection.cursor() as cursor:
+                # COPY streams the whole batch in one go, without parsing and
+                # planning a statement per row
+                async with cursor.copy(COPY_SQL) as copy:
+                    for row in rows:
+                        await copy.write_row(row)
+        except psycopg.Error as e:
+            self.log_error(e, spider)
+
+    async def promote(self, spider):
+        try:
+            async with self.pool.connection() as connection, connection.cursor() as cursor:
+                await cursor.execute("LOCK TABLE sreality_stage")
+                await cursor.execute(PROMOTE_SQL)
+                stored = cursor.rowcount
+                await cursor.execute("TRUNCATE sreality_stage")
+        except psycopg.Error as e:
+            self.log_error(e, spider)
+        else:
+            spider.logger.info("%d new items stored in the database", stored)
+
+    def log_error(self, e, spider):
+        spider.logger.error("Error processing items: %s", e)
+        with open('exceptions.log', 'a') as f:
+            f.write(f"{e}\n")
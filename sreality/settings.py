@@ -7,11 +7,17 @@
 #     https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
 #     https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+from decouple import config
+
 BOT_NAME = "sreality"
 
 SPIDER_MODULES = ["sreality.spiders"]
 NEWSPIDER_MODULE = "sreality.spiders"
 
+# Set LOG_LEVEL=WARNING in .env for production runs to skip formatting and
+# emitting the per-request DEBUG/INFO records
+LOG_LEVEL = config('LOG_LEVEL', default='INFO')
+
 
 # Crawl responsibly by identifying yourself (and your website) on the user-agent
 #USER_AGENT = "sreality (+http://www.yourdomain.com)"
@@ -20,21 +26,28 @@ NEWSPIDER_MODULE = "sreality.spiders"
 ROBOTSTXT_OBEY = False
 
 # Configure maximum concurrent requests performed by Scrapy (default: 16)
-#CONCURRENT_REQUESTS = 32
+CONCURRENT_REQUESTS = 64
 
 # Configure a delay for requests for the same website (default: 0)
 # See https://docs.scrapy.org/en/latest/topics/settings.html#download-delay
 # See also autothrottle settings and docs
 #DOWNLOAD_DELAY = 3
 # The download delay setting will honor only one of:
-#CONCURRENT_REQUESTS_PER_DOMAIN = 16
+CONCURRENT_REQUESTS_PER_DOMAIN = 64
 #CONCURRENT_REQUESTS_PER_IP = 16
 
 # Disable cookies (enabled by default)
-#COOKIES_ENABLED = False
+COOKIES_ENABLED = False
 
 # Disable Telnet Console (enabled by default)
-#TELNETCONSOLE_ENABLED = False
+TELNETCONSOLE_ENABLED = False
+
+# The spider only calls the JSON API, redirects are not followed
+REDIRECT_ENABLED = False
+
+# Thread pool used for DNS resolution (default: 10) and DNS timeout (default: 60)
+REACTOR_THREADPOOL_MAXSIZE = 20
+DNS_TIMEOUT = 10
 
 # Override the default request headers:
 DEFAULT_REQUEST_HEADERS = {
@@ -55,15 +68,23 @@ DEFAULT_REQUEST_HEADERS = {
 
 # Enable or disable spider middlewares
 # See https://docs.scrapy.org/en/latest/topics/spider-middleware.html
-#SPIDER_MIDDLEWARES = {
+# The Referer header is fixed in DEFAULT_REQUEST_HEADERS and the API URLs are
+# short, RefererMiddleware would replace it with the previous API URL
+SPIDER_MIDDLEWARES = {
 #    "sreality.middlewares.SrealitySpiderMiddleware": 543,
-#}
+    "scrapy.spidermiddlewares.referer.RefererMiddleware": None,
+    "scrapy.spidermiddlewares.urllength.UrlLengthMiddleware": None,
+}
 
 # Enable or disable downloader middlewares
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
-#DOWNLOADER_MIDDLEWARES = {
+# User-Agent is sent from DEFAULT_REQUEST_HEADERS and no HTTP auth is used.
+# Redirects and cookies are already switched off above
+DOWNLOADER_MIDDLEWARES = {
 #    "sreality.middlewares.SrealityDownloaderMiddleware": 543,
-#}
+    "scrapy.downloadermiddlewares.httpauth.HttpAuthMiddleware": None,
+    "scrapy.downloadermiddlewares.useragent.UserAgentMiddleware": None,
+}
 
 # Enable or disable extensions
 # See https://docs.scrapy.org/en/latest/topics/extensions.html
@@ -79,24 +100,30 @@ ITEM_PIPELINES = {
 
 # Enable and configure the AutoThrottle extension (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
-#AUTOTHROTTLE_ENABLED = True
+AUTOTHROTTLE_ENABLED = True
 # The initial download delay
-#AUTOTHROTTLE_START_DELAY = 5
+AUTOTHROTTLE_START_DELAY = 1
 # The maximum download delay to be set in case of high latencies
 #AUTOTHROTTLE_MAX_DELAY = 60
 # The average number of requests Scrapy should be sending in parallel to
 # each remote server
-#AUTOTHROTTLE_TARGET_CONCURRENCY = 1.0
+AUTOTHROTTLE_TARGET_CONCURRENCY = 32.0
 # Enable showing throttling stats for every response received:
 #AUTOTHROTTLE_DEBUG = False
 
 # Enable and configure HTTP caching (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html#httpcache-middleware-settings
-#HTTPCACHE_ENABLED = True
-#HTTPCACHE_EXPIRATION_SECS = 0
+HTTPCACHE_ENABLED = True
+HTTPCACHE_EXPIRATION_SECS = 3600
 #HTTPCACHE_DIR = "httpcache"
 #HTTPCACHE_IGNORE_HTTP_CODES = []
-#HTTPCACHE_STORAGE = "scrapy.extensions.httpcache.FilesystemCacheStorage"
+HTTPCACHE_STORAGE = "scrapy.extensions.httpcache.FilesystemCacheStorage"
+HTTPCACHE_POLICY = "scrapy.extensions.httpcache.RFC2616Policy"
+
+# Ask the API for gzip/deflate encoded responses (enabled by default). The
+# cache sits below HttpCompressionMiddleware and already stores the
+# compressed bodies, so HTTPCACHE_GZIP would only compress them twice
+COMPRESSION_ENABLED = True
 
 # Set settings whose default value is deprecated to a future-proof value
 REQUEST_FINGERPRINTER_IMPLEMENTATION = "2.7"